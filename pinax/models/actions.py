@@ -8,6 +8,7 @@ from django.utils.encoding import force_str
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy
 
+from .models import LogicalDeleteModel
 from .utils import get_logical_deleted_objects
 
 
@@ -45,11 +46,18 @@ def logical_delete_selected(modeladmin, request, queryset):
     if request.POST.get('post') and not protected:
         if perms_needed:
             raise PermissionDenied
-        n = queryset.count()
+        if issubclass(modeladmin.model, LogicalDeleteModel):
+            # already deleted objects are neither deleted again nor logged
+            queryset = queryset.not_deleted()
+        n = len(queryset)
         if n:
-            for obj in queryset:
-                obj_display = force_str(obj)
-                modeladmin.log_deletion(request, obj, obj_display)
+            if hasattr(modeladmin, 'log_deletions'):
+                # Django 5.1+ creates all log entries with a single query
+                modeladmin.log_deletions(request, queryset)
+            else:
+                for obj in queryset:
+                    obj_display = force_str(obj)
+                    modeladmin.log_deletion(request, obj, obj_display)
             queryset.delete()
             modeladmin.message_user(
                 request,
@@ -74,7 +82,7 @@ def logical_delete_selected(modeladmin, request, queryset):
         title=title,
         objects_name=objects_name,
         deletable_objects=[deletable_objects],
-        model_count=dict(model_count).items(),
+        model_count=model_count.items(),
         queryset=queryset,
         perms_lacking=perms_needed,
         protected=protected,
@@ -1,4 +1,4 @@
-from functools import partial
+from functools import lru_cache, partial
 
 from django import forms
 from django.contrib import admin
@@ -7,12 +7,15 @@ from django.contrib.admin.options import IS_POPUP_VAR, TO_FIELD_VAR
 from django.contrib.admin.utils import flatten_fieldsets, unquote
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import router
+from django.db.models import BooleanField, ExpressionWrapper, Q
 from django.forms.formsets import DELETION_FIELD_NAME
 from django.forms.models import modelform_defines_fields, inlineformset_factory
 from django.utils.encoding import force_str
 from django.utils.text import get_text_list
 from django.utils.translation import gettext_lazy as _
 
+from . import settings as app_settings
+from .models import LogicalDeleteModel
 from .utils import get_logical_deleted_objects
 from .deletion import LogicalDeleteNestedObjects
 
@@ -22,16 +25,31 @@ class LogicalDeleteModelAdmin(admin.ModelAdmin):
     A base model admin to use in providing access to to logically deleted
     objects.
     """
-    list_display = ("id", "__unicode__", "active")
+    list_display = ("id", "__str__", "active")
     list_display_filter = ("active",)
 
-    def queryset(self, request):
-        qs = self.model._default_manager.all_with_deleted()
-        ordering = self.ordering or ()
+    def get_queryset(self, request):
+        # `active` column is computed by database instead of calling
+        # `active()` method of every object
+        qs = self.model._default_manager.all_with_deleted().annotate(
+            is_active_annotation=ExpressionWrapper(
+                Q(**{"%s__isnull" % app_settings.FIELD_NAME: True}),
+                output_field=BooleanField(),
+            )
+        )
+        ordering = self.get_ordering(request)
         if ordering:
             qs = qs.order_by(*ordering)
         return qs
 
+    def active(self, obj):
+        try:
+            return obj.is_active_annotation
+        except AttributeError:
+            return obj.active()
+    active.boolean = True
+    active.admin_order_field = "is_active_annotation"
+
 
 class LogicalDeleteViewMixin(object):
     """Mixin for ``ModelAdmin`` classes with custom `delete_view`.
@@ -66,7 +84,10 @@ class LogicalDeleteViewMixin(object):
         if not self.has_delete_permission(request, obj):
             raise PermissionDenied
 
-        if obj is None:
+        if obj is None or (
+            isinstance(obj, LogicalDeleteModel) and not obj.active()
+        ):
+            # already deleted object can't be deleted again
             return self._get_obj_does_not_exist_redirect(
                 request, opts, object_id
             )
@@ -104,7 +125,7 @@ class LogicalDeleteViewMixin(object):
             object_name=object_name,
             object=obj,
             deleted_objects=deleted_objects,
-            model_count=dict(model_count).items(),
+            model_count=model_count.items(),
             perms_lacking=perms_needed,
             protected=protected,
             opts=opts,
@@ -119,6 +140,56 @@ class LogicalDeleteViewMixin(object):
         return self.render_delete_form(request, context)
 
 
+@lru_cache(maxsize=128)
+def _get_delete_protected_form(base_model_form):
+    """Return subclass of `base_model_form` which checks protected objects.
+
+    This is the form class from original `get_formset` method of
+    ``InlineModelAdmin``, which uses custom ``LogicalDeleteNestedObjects``
+    collector class. Classes are cached by base form, so new class isn't
+    created on every `get_formset` call. Cache is bounded, because forms
+    may be created per request, e.g. by `get_form` of ``ModelAdmin``.
+
+    """
+    class DeleteProtectedModelForm(base_model_form):
+        def hand_clean_DELETE(self):
+            """
+            We don't validate the 'DELETE' field itself because on
+            templates it's not rendered using the field information, but
+            just using a generic "deletion_field" of the InlineModelAdmin.
+            """
+            if self.cleaned_data.get(DELETION_FIELD_NAME, False):
+                using = router.db_for_write(self._meta.model)
+                collector = LogicalDeleteNestedObjects(using=using)
+                if self.instance.pk is None:
+                    return
+                collector.collect([self.instance])
+                if collector.protected:
+                    objs = []
+                    for p in collector.protected:
+                        objs.append(
+                            # Translators: Model verbose name and instance representation,
+                            # suitable to be an item in a list.
+                            _('%(class_name)s %(instance)s') % {
+                                'class_name': p._meta.verbose_name,
+                                'instance': p}
+                        )
+                    params = {'class_name': self._meta.model._meta.verbose_name,
+                              'instance': self.instance,
+                              'related_objects': get_text_list(objs, _('and'))}
+                    msg = _("Deleting %(class_name)s %(instance)s would require "
+                            "deleting the following protected related objects: "
+                            "%(related_objects)s")
+                    raise ValidationError(msg, code='deleting_protected', params=params)
+
+        def is_valid(self):
+            result = super(DeleteProtectedModelForm, self).is_valid()
+            self.hand_clean_DELETE()
+            return result
+
+    return DeleteProtectedModelForm
+
+
 class LogicalDeleteInlineMixin(object):
     """Mixin for ``InlineModelAdmin`` with custom `get_formset`.
 
@@ -165,45 +236,7 @@ class LogicalDeleteInlineMixin(object):
         }
 
         defaults.update(kwargs)
-        base_model_form = defaults['form']
-
-        class DeleteProtectedModelForm(base_model_form):
-            def hand_clean_DELETE(self):
-                """
-                We don't validate the 'DELETE' field itself because on
-                templates it's not rendered using the field information, but
-                just using a generic "deletion_field" of the InlineModelAdmin.
-                """
-                if self.cleaned_data.get(DELETION_FIELD_NAME, False):
-                    using = router.db_for_write(self._meta.model)
-                    collector = LogicalDeleteNestedObjects(using=using)
-                    if self.instance.pk is None:
-                        return
-                    collector.collect([self.instance])
-                    if collector.protected:
-                        objs = []
-                        for p in collector.protected:
-                            objs.append(
-                                # Translators: Model verbose name and instance representation,
-                                # suitable to be an item in a list.
-                                _('%(class_name)s %(instance)s') % {
-                                    'class_name': p._meta.verbose_name,
-                                    'instance': p}
-                            )
-                        params = {'class_name': self._meta.model._meta.verbose_name,
-                                  'instance': self.instance,
-                                  'related_objects': get_text_list(objs, _('and'))}
-                        msg = _("Deleting %(class_name)s %(instance)s would require "
-                                "deleting the following protected related objects: "
-                                "%(related_objects)s")
-                        raise ValidationError(msg, code='deleting_protected', params=params)
-
-            def is_valid(self):
-                result = super(DeleteProtectedModelForm, self).is_valid()
-                self.hand_clean_DELETE()
-                return result
-
-        defaults['form'] = DeleteProtectedModelForm
+        defaults['form'] = _get_delete_protected_form(defaults['form'])
 
         if defaults['fields'] is None and not modelform_defines_fields(defaults['form']):
             defaults['fields'] = forms.ALL_FIELDS
@@ -1,10 +1,34 @@
-import operator
-from collections import defaultdict
-from functools import reduce
+from collections import Counter, defaultdict
+from functools import lru_cache
 
-from django.db import models
-from django.db.models import query_utils
-from django.db.models.deletion import Collector
+from django.db import models, transaction
+from django.db.models import query_utils, sql
+from django.db.models.deletion import Collector, ProtectedError
+from django.db.models.query import QuerySet, prefetch_related_objects
+from django.utils import timezone
+
+from . import settings as app_settings
+from .signals import post_softdelete, pre_softdelete
+
+# name of field with deletion date, resolved once for hot delete paths
+_FIELD_NAME = app_settings.FIELD_NAME
+
+
+@lru_cache(maxsize=None)
+def _get_related_lookups(related_model, related_fields):
+    """Return `__in` lookups to filter `related_model` by `related_fields`.
+
+    Collector walks the same relations for every batch of collected objects,
+    so lookups are built once per relation. Lookups use column attributes
+    (`<field>_id`), so related objects are filtered by plain values, and each
+    lookup is paired with the attribute name of the referenced field to take
+    these values from.
+
+    """
+    return tuple(
+        ('%s__in' % related_field.attname, related_field.target_field.attname)
+        for related_field in related_fields
+    )
 
 
 class LogicalDeleteCollector(Collector):
@@ -22,15 +46,22 @@ class LogicalDeleteCollector(Collector):
         """Custom `related_objects` method.
 
         This method uses `_default_manager` instead of `_base_manager`.
+        Related objects are filtered by referenced values (usually primary
+        keys) instead of model instances.
 
         """
-        predicate = reduce(operator.or_, (
-            query_utils.Q(**{'%s__in' % related_field.name: objs})
-            for related_field in related_fields
-        ))
-        return related_model._default_manager.using(self.using).filter(
-            predicate
-        )
+        lookups = _get_related_lookups(related_model, tuple(related_fields))
+        queryset = related_model._default_manager.using(self.using)
+        if len(lookups) == 1:
+            lookup, attname = lookups[0]
+            return queryset.filter(
+                **{lookup: {getattr(obj, attname) for obj in objs}}
+            )
+        predicate = query_utils.Q(*(
+            (lookup, {getattr(obj, attname) for obj in objs})
+            for lookup, attname in lookups
+        ), _connector=query_utils.Q.OR)
+        return queryset.filter(predicate)
 
 
 class LogicalDeleteNestedObjects(LogicalDeleteCollector):
@@ -43,12 +74,11 @@ class LogicalDeleteNestedObjects(LogicalDeleteCollector):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.edges = {}  # {from_instance: [to_instances]}
+        self.edges = defaultdict(list)  # {from_instance: [to_instances]}
         self.protected = set()
-        self.model_objs = defaultdict(set)
 
     def add_edge(self, source, target):
-        self.edges.setdefault(source, []).append(target)
+        self.edges[source].append(target)
 
     def collect(self, objs, source=None, source_attr=None, **kwargs):
         for obj in objs:
@@ -60,7 +90,6 @@ class LogicalDeleteNestedObjects(LogicalDeleteCollector):
                 self.add_edge(getattr(obj, related_name), obj)
             else:
                 self.add_edge(None, obj)
-            self.model_objs[obj._meta.model].add(obj)
         try:
             return super().collect(objs, source_attr=source_attr, **kwargs)
         except models.ProtectedError as e:
@@ -70,29 +99,69 @@ class LogicalDeleteNestedObjects(LogicalDeleteCollector):
         qs = super().related_objects(related_model, related_fields, objs)
         return qs.select_related(*(f.name for f in related_fields))
 
-    def _nested(self, obj, seen, format_callback):
-        if obj in seen:
+    def _nested(self, obj, seen, format_callback, limit=None, shown=None):
+        """Return nested list for `obj` and its children.
+
+        Graph is walked with an explicit stack instead of recursion, so deep
+        graphs don't hit the recursion limit. Each stack item is a node, an
+        iterator over its children and a list of already built children.
+
+        Objects are counted in `shown` counter. If `limit` is set, objects of
+        models which already have `limit` objects in it are skipped together
+        with their children.
+
+        """
+        if obj in seen or not self._show(obj, limit, shown):
             return []
         seen.add(obj)
-        children = []
-        for child in self.edges.get(obj, ()):
-            children.extend(self._nested(child, seen, format_callback))
-        if format_callback:
-            ret = [format_callback(obj)]
-        else:
-            ret = [obj]
-        if children:
-            ret.append(children)
-        return ret
+        stack = [(obj, iter(self.edges.get(obj, ())), [])]
+        while True:
+            node, targets, children = stack[-1]
+            for child in targets:
+                if child not in seen and self._show(child, limit, shown):
+                    seen.add(child)
+                    stack.append((child, iter(self.edges.get(child, ())), []))
+                    break
+            else:
+                stack.pop()
+                if format_callback:
+                    ret = [format_callback(node)]
+                else:
+                    ret = [node]
+                if children:
+                    ret.append(children)
+                if not stack:
+                    return ret
+                stack[-1][2].extend(ret)
+
+    @staticmethod
+    def _show(obj, limit, shown):
+        """Check if `obj` fits into `limit` and count it in `shown`."""
+        model = obj._meta.model
+        if limit is not None and shown[model] >= limit:
+            return False
+        shown[model] += 1
+        return True
 
-    def nested(self, format_callback=None):
+    def nested(self, format_callback=None, limit=None, shown=None):
         """
         Return the graph as a nested list.
+
+        `limit` is the max number of objects of each model to include, other
+        objects are skipped with their children. Use it when the graph is
+        only displayed, as in delete confirmation pages.
+
+        `shown` is a ``Counter``, if passed it's updated with numbers of
+        included objects per model.
         """
         seen = set()
+        if shown is None:
+            shown = Counter()
         roots = []
         for root in self.edges.get(None, ()):
-            roots.extend(self._nested(root, seen, format_callback))
+            roots.extend(
+                self._nested(root, seen, format_callback, limit, shown)
+            )
         return roots
 
     def can_fast_delete(self, *args, **kwargs):
@@ -101,3 +170,241 @@ class LogicalDeleteNestedObjects(LogicalDeleteCollector):
         them to the user in confirm page.
         """
         return False
+
+
+def soft_delete(model, objs, using, signals=True, collect_related=True):
+    """Soft-delete `objs` of `model` together with their related objects.
+
+    This is shared by ``LogicalDeleteModel.delete()`` and
+    ``LogicalDeleteQuerySet.delete()``. Objects are soft-deleted with a
+    single ``UPDATE``, related objects are deleted in bulk (see
+    `delete_related_objects`), all of it in a single transaction.
+
+    Args:
+        model(Model): model of `objs`
+        objs(list): not deleted objects to soft-delete
+        using(str): alias of database to delete objects from
+        signals(bool): send `pre_softdelete` and `post_softdelete` signals
+        collect_related(bool): collect and delete related objects
+
+    Returns:
+        (int, dict): number of deleted objects and number of deleted
+        objects per model label, the same as ``QuerySet.delete()``
+
+    """
+    send_post = _pre_soft_delete(model, objs, signals)
+
+    if collect_related:
+        collector, to_delete = _collect_related_objects(objs, using)
+    else:
+        collector, to_delete = None, []
+
+    with transaction.atomic(using=using, savepoint=False):
+        now = timezone.now()
+        deleted_counter = Counter(
+            delete_related_objects(to_delete, now, using, signals)
+        )
+
+        # Update related object fields (SET_NULL)
+        if collector is not None and collector.field_updates:
+            update_related_fields(collector)
+
+        deleted_counter[model._meta.label] += _soft_delete_update(
+            model, objs, now, using, send_post
+        )
+
+    return sum(deleted_counter.values()), dict(deleted_counter)
+
+
+def _collect_related_objects(objs, using):
+    """Collect related objects to delete with `objs`.
+
+    It forbids to delete objects if they have protected related objects.
+    Collection is done before the deletion transaction, so raised
+    ``ProtectedError`` doesn't break transaction of the caller.
+
+    Returns:
+        (LogicalDeleteNestedObjects, list): collector and collected objects
+        except `objs`
+
+    """
+    collector = LogicalDeleteNestedObjects(using=using)
+    collector.collect(objs)
+    return collector, get_collected_objects(collector, objs)
+
+
+def get_collected_objects(collector, objs):
+    """Get objects collected by `collector` to delete with `objs`.
+
+    It forbids to delete objects if they have protected related objects.
+
+    Args:
+        collector(LogicalDeleteNestedObjects): collector which has already
+            collected related objects of `objs`
+        objs(list): collected objects to delete
+
+    Returns:
+        (list): collected objects except `objs`
+
+    """
+    if collector.protected:
+        if len(objs) == 1:
+            msg = (
+                'Cannot delete object "{obj}" as it has protected relations.'
+                .format(obj=objs[0])
+            )
+        else:
+            msg = 'Cannot delete objects as they have protected relations.'
+        raise ProtectedError(msg, collector.protected)
+
+    roots = set(objs)
+    return [
+        obj
+        for instances in collector.data.values()
+        for obj in instances
+        if obj not in roots
+    ]
+
+
+def _is_soft_deletable(model):
+    """Check if `model` is a ``LogicalDeleteModel`` subclass.
+
+    It's called once per model of collected objects, see
+    `delete_related_objects`.
+
+    """
+    # Imported here to avoid circular import
+    from .models import LogicalDeleteModel
+
+    return issubclass(model, LogicalDeleteModel)
+
+
+def delete_related_objects(objs, now, using=None, signals=True):
+    """Delete related objects of soft-deleted objects in bulk.
+
+    Objects of ``LogicalDeleteModel`` subclasses, which aren't deleted yet,
+    are soft-deleted with one ``UPDATE`` per model. Objects of other models
+    are deleted with one ``DELETE`` per model.
+
+    Args:
+        objs(iterable): related objects to delete
+        now(datetime): deletion date of soft-deleted objects
+        using(str): alias of database to delete objects from
+        signals(bool): send `pre_softdelete` and `post_softdelete` signals
+            for soft-deleted objects
+
+    Returns:
+        (dict): number of deleted objects per model label
+
+    """
+    # Group related objects by model, so each model is processed once
+    objs_by_model = defaultdict(list)
+    for obj in objs:
+        objs_by_model[obj.__class__].append(obj)
+
+    deleted_counter = Counter()
+
+    for model, objs in objs_by_model.items():
+        if not _is_soft_deletable(model):
+            _, rows_count = model._base_manager.using(using).filter(
+                pk__in=[obj.pk for obj in objs]
+            ).delete()
+            deleted_counter.update(rows_count)
+        else:
+            deleted_counter[model._meta.label] += _soft_delete_objects(
+                model, objs, now, using, signals
+            )
+
+    return dict(deleted_counter)
+
+
+def _soft_delete_objects(model, objs, now, using, signals):
+    """Soft-delete `objs` of `model` with a single ``UPDATE``.
+
+    Returns:
+        (int): number of soft-deleted objects
+    """
+    # check if objects are already deleted, field may be deferred by the
+    # collector, but then objects come from queryset of not deleted ones
+    objs = [obj for obj in objs if obj.__dict__.get(_FIELD_NAME) is None]
+    if not objs:
+        return 0
+
+    send_post = _pre_soft_delete(model, objs, signals)
+    return _soft_delete_update(model, objs, now, using, send_post)
+
+
+def _pre_soft_delete(model, objs, signals):
+    """Prepare `objs` of `model` to soft-delete and send `pre_softdelete`.
+
+    Signals are dispatched per object only if somebody listens to them,
+    relations from `get_softdelete_prefetches` are prefetched for them.
+
+    Returns:
+        (bool): if `post_softdelete` should be sent for `objs`
+    """
+    send_pre = signals and pre_softdelete.has_listeners(model)
+    send_post = signals and post_softdelete.has_listeners(model)
+    prefetches = model.get_softdelete_prefetches()
+    if prefetches and (send_pre or send_post):
+        prefetch_related_objects(objs, *prefetches)
+    if send_pre:
+        for obj in objs:
+            pre_softdelete.send(sender=model, instance=obj)
+    return send_post
+
+
+def _soft_delete_update(model, objs, now, using, send_post):
+    """Set deletion date of `objs` of `model` and send `post_softdelete`.
+
+    Returns:
+        (int): number of updated rows
+    """
+    rows_count = model._base_manager.using(using).filter(
+        pk__in=[obj.pk for obj in objs]
+    ).update(**{_FIELD_NAME: now})
+    for obj in objs:
+        obj.__dict__[_FIELD_NAME] = now
+    if send_post:
+        for obj in objs:
+            post_softdelete.send(sender=model, instance=obj)
+    return rows_count
+
+
+def _is_lazy(instances):
+    """Check if `instances` is a queryset which isn't evaluated yet."""
+    if not isinstance(instances, QuerySet):
+        return False
+    return instances._result_cache is None
+
+
+def update_related_fields(collector):
+    """Update fields of related objects collected by `collector`.
+
+    These are fields of relations with `on_delete=models.SET_NULL` (or
+    another `on_delete` handler which updates fields).
+
+    """
+    for (field, value), instances_list in collector.field_updates.items():
+        if len(instances_list) == 1 and _is_lazy(instances_list[0]):
+            # single queryset is updated as is without fetching its objects
+            instances_list[0].update(**{field.name: value})
+            continue
+
+        pks = []
+        model = None
+        for instances in instances_list:
+            if _is_lazy(instances):
+                # fetch just pks instead of combining querysets with `|`,
+                # so all instances are updated by the same query
+                model = instances.model
+                pks.extend(instances.values_list('pk', flat=True))
+            else:
+                for obj in instances:
+                    model = obj.__class__
+                    pks.append(obj.pk)
+        if pks:
+            # pks of all instances are updated at once, `update_batch`
+            # splits them into statements of limited size
+            query = sql.UpdateQuery(model)
+            query.update_batch(pks, {field.name: value}, collector.using)
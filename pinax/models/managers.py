@@ -24,20 +24,38 @@ class LogicalDeletedManager(models.Manager):
         if queryset_class:
             self.queryset_class = queryset_class
 
+    def _get_base_queryset(self):
+        """Retrieve unfiltered queryset shared by querysets of the manager
+
+        Queryset is built once and then cloned by callers. It's rebuilt if the
+        manager was copied for another model or database (managers
+        inheritance, `db_manager()`).
+        """
+        queryset = self.__dict__.get('_base_queryset')
+        if not self._is_own_queryset(queryset):
+            queryset = self._base_queryset = self.queryset_class(
+                self.model, using=self._db)
+        return queryset
+
+    def _is_own_queryset(self, queryset):
+        """Check if `queryset` is built for model and database of the manager
+        """
+        if queryset is None:
+            return False
+        if queryset.model is not self.model:
+            return False
+        return queryset._db == self._db
+
     def all_with_deleted(self):
-        if self.model:
-            return self.queryset_class(self.model, using=self._db)
+        return self._get_base_queryset().all()
 
     def get_queryset(self):
         """Retrieve only not deleted objects
         """
-        if self.model:
-            return self.queryset_class(
-                self.model, using=self._db).not_deleted()
+        return self._get_base_queryset().not_deleted()
 
     def only_deleted(self):
-        if self.model:
-            return self.queryset_class(self.model, using=self._db).deleted()
+        return self._get_base_queryset().deleted()
 
     def get(self, *args, **kwargs):
         if app_settings.ACCESSIBLE_BY_PK:
@@ -1,14 +1,15 @@
-from functools import reduce
-from operator import or_
+from collections import defaultdict
 
 from django.core.exceptions import NON_FIELD_ERRORS
-from django.db import models
-from django.utils import timezone
+from django.db import models, router
 
 from . import managers
-from . import settings as app_settings
-from .signals import post_softdelete, pre_softdelete
-from .utils import get_collector, get_related_objects
+from .deletion import _FIELD_NAME, soft_delete
+
+# {(model, unique_checks): plan}, see `_get_unique_check_plan`. Size is
+# bounded by models and sets of their unique checks, which depend only on
+# fields excluded from validation (e.g. by model forms)
+_unique_check_plans = {}
 
 
 class LogicalDeleteModel(models.Model):
@@ -22,82 +23,69 @@ class LogicalDeleteModel(models.Model):
     objects = managers.LogicalDeletedManager()
 
     def active(self):
-        return getattr(self, app_settings.FIELD_NAME) is None
+        return getattr(self, _FIELD_NAME) is None
     active.boolean = True
 
-    def delete(self, hard_delete=False, _collect_related=True):
+    @classmethod
+    def get_softdelete_prefetches(cls):
+        """Return relations to prefetch for soft-deleted related objects.
+
+        Override it with relations used by `pre_softdelete` and
+        `post_softdelete` receivers, so they don't hit database for each
+        object. Relations are prefetched only if signals have receivers.
+
+        Returns:
+            (list): lookups for `prefetch_related_objects`
+        """
+        return []
+
+    def delete(self, hard_delete=False, signals=True, _collect_related=True):
         """Soft-delete the object.
 
         Args:
             hard_delete(bool): force hard object deletion
+            signals(bool): send `pre_softdelete` and `post_softdelete` signals
+                for the object and for every soft-deleted related object
             _collect_related(bool): is deletion of this object requires to
                 collect and delete some related objects.
 
+        Related objects are deleted in bulk: one ``UPDATE`` per soft-deletable
+        model and one ``DELETE`` per other model, instead of deleting them one
+        by one.
+
         `_collect_related` used with cascade deletion. Just root object
         should collect related objects. If related objects will also start to
         collect realted objects we may fail into endless recursion
+
+        Deletion of already soft-deleted object does nothing: signals aren't
+        sent and deletion date isn't changed.
+
+        Returns:
+            (int, dict): number of deleted objects and number of deleted
+            objects per model label, the same as ``Model.delete()``
         """
         if hard_delete:
             return self.hard_delete()
 
-        # Call pre_delete signals
-        pre_softdelete.send(sender=self.__class__, instance=self)
+        if self.__dict__.get(_FIELD_NAME) is not None:
+            return 0, {}
 
-        # Fetch related models
-        if _collect_related:
-            collector = get_collector(self)
-            to_delete = get_related_objects(self, collector=collector)
-        else:
-            collector = None
-            to_delete = []
-
-        for obj in to_delete:
-            if isinstance(obj, LogicalDeleteModel):
-                # check if object is already deleted
-                if not getattr(obj, app_settings.FIELD_NAME):
-                    obj.delete(_collect_related=False)
-            else:
-                obj.delete()
-
-        # Soft delete the object
-        setattr(self, app_settings.FIELD_NAME, timezone.now())
-        self.save()
-
-        # Update related object fields (SET_NULL)
-        if _collect_related and collector:
-            for (field, value), instances_list in collector.field_updates.items():
-                updates = []
-                objs = []
-                for instances in instances_list:
-                    if (
-                        isinstance(instances, models.QuerySet)
-                        and instances._result_cache is None
-                    ):
-                        updates.append(instances)
-                    else:
-                        objs.extend(instances)
-                if updates:
-                    combined_updates = reduce(or_, updates)
-                    combined_updates.update(**{field.name: value})
-                if objs:
-                    model = objs[0].__class__
-                    query = models.sql.UpdateQuery(model)
-                    query.update_batch(
-                        [obj.pk for obj in instances],
-                        {field.name: value},
-                        collector.using
-                    )
-
-        post_softdelete.send(sender=self.__class__, instance=self)
+        using = router.db_for_write(self.__class__, instance=self)
+        return soft_delete(
+            self.__class__, [self], using,
+            signals=signals, collect_related=_collect_related,
+        )
 
     def hard_delete(self, using=None, keep_parents=False):
         """Method to hard delete object.
 
-        This is the original `delete()` method from ``Model`` class, but
-        with using of ``LogicalDeleteCollector`` instead of ``Collector``.
+        This is the original `delete()` method from ``Model`` class. It uses
+        original ``Collector``, so related objects are collected with
+        `_base_manager` including already soft-deleted ones, otherwise they
+        would be left referencing deleted object.
 
         """
-        super().delete()
+        return super().delete(using=using, keep_parents=keep_parents)
 
     class Meta:
         abstract = True
@@ -106,22 +94,50 @@ class LogicalDeleteModel(models.Model):
         """This is overriden django model's method.
 
         It almost fully copy-pasted from django sources. Changed just
-        line where filtered model objects
+        line where filtered model objects. Also several checks of the same
+        model are done with a single query instead of a query per check.
         """
+        if not unique_checks:
+            return {}
+
         errors = {}
 
-        for model_class, unique_check in unique_checks:
+        checks_by_model = self._get_unique_check_lookups(unique_checks)
+        for model_class, checks in checks_by_model.items():
+            for unique_check in self._get_failed_unique_checks(
+                model_class, checks
+            ):
+                if len(unique_check) == 1:
+                    key = unique_check[0]
+                else:
+                    key = NON_FIELD_ERRORS
+                errors.setdefault(key, []).append(
+                    self.unique_error_message(model_class, unique_check)
+                )
+
+        return errors
+
+    def _get_unique_check_lookups(self, unique_checks):
+        """Build lookups of `unique_checks` from object's values.
+
+        Returns:
+            (dict): ``{model_class: [(unique_check, lookup_kwargs)]}``, checks
+            with skipped fields are left out
+        """
+        checks_by_model = defaultdict(list)
+        unique_check_plan = self._get_unique_check_plan(tuple(unique_checks))
+        adding = self._state.adding
+        for model_class, unique_check, fields in unique_check_plan:
             # Try to look up an existing object with the same values as this
             # object's values for all the unique field.
 
             lookup_kwargs = {}
-            for field_name in unique_check:
-                f = self._meta.get_field(field_name)
-                lookup_value = getattr(self, f.attname)
+            for field_name, attname, primary_key in fields:
+                lookup_value = getattr(self, attname)
                 if lookup_value is None:
                     # no value, skip the lookup
                     continue
-                if f.primary_key and not self._state.adding:
+                if primary_key and not adding:
                     # no need to check for unique primary key when editing
                     continue
                 lookup_kwargs[str(field_name)] = lookup_value
@@ -130,6 +146,25 @@ class LogicalDeleteModel(models.Model):
             if len(unique_check) != len(lookup_kwargs):
                 continue
 
+            checks_by_model[model_class].append((unique_check, lookup_kwargs))
+        return checks_by_model
+
+    def _get_failed_unique_checks(self, model_class, checks):
+        """Return unique checks of `model_class` failed by existing objects.
+
+        Querysets of several checks are combined with ``UNION``, so all
+        checks of a model cost one query.
+
+        Args:
+            model_class(Model): model to look up existing objects of
+            checks(list): ``(unique_check, lookup_kwargs)`` items
+
+        Returns:
+            (list): failed unique checks
+        """
+        model_class_pk = self._get_pk_val(model_class._meta)
+        querysets = []
+        for unique_check, lookup_kwargs in checks:
             # Here are the changes
             qs = self._get_queryset_for_unique_checks(
                 model_class, lookup_kwargs
@@ -141,24 +176,57 @@ class LogicalDeleteModel(models.Model):
             # self.pk. These can be different fields because model inheritance
             # allows single model to have effectively multiple primary keys.
             # Refs #17615.
-            model_class_pk = self._get_pk_val(model_class._meta)
             if not self._state.adding and model_class_pk is not None:
                 qs = qs.exclude(pk=model_class_pk)
-            if qs.exists():
-                if len(unique_check) == 1:
-                    key = unique_check[0]
-                else:
-                    key = NON_FIELD_ERRORS
-                errors.setdefault(key, []).append(
-                    self.unique_error_message(model_class, unique_check)
-                )
+            querysets.append(qs)
+
+        if len(querysets) == 1:
+            return [checks[0][0]] if querysets[0].exists() else []
+
+        # every queryset returns index of its check for matched objects
+        querysets = [
+            qs.annotate(
+                _unique_check=models.Value(index)
+            ).order_by().values_list('_unique_check', flat=True)
+            for index, qs in enumerate(querysets)
+        ]
+        failed = set(querysets[0].union(*querysets[1:], all=True))
+        return [
+            unique_check
+            for index, (unique_check, _) in enumerate(checks)
+            if index in failed
+        ]
+
+    @classmethod
+    def _get_unique_check_plan(cls, unique_checks):
+        """Resolve fields used in `unique_checks` once per model.
+
+        Returns tuple of ``(model_class, unique_check, fields)`` items, where
+        `fields` is a tuple of ``(field_name, attname, primary_key)``.
+        """
+        key = (cls, unique_checks)
+        plan = _unique_check_plans.get(key)
+        if plan is None:
+            plan = _unique_check_plans[key] = cls._build_unique_check_plan(
+                unique_checks
+            )
+        return plan
 
-        return errors
+    @classmethod
+    def _build_unique_check_plan(cls, unique_checks):
+        plan = []
+        for model_class, unique_check in unique_checks:
+            fields = []
+            for field_name in unique_check:
+                f = cls._meta.get_field(field_name)
+                fields.append((field_name, f.attname, f.primary_key))
+            plan.append((model_class, unique_check, tuple(fields)))
+        return tuple(plan)
 
     def _get_queryset_for_unique_checks(self, model_class, lookup_kwargs):
         """Hook for inserting custom queryset for unique checks
 
-        See docstring of ``_perform_unique_checks``
+        See docstring of ``_perform_unique_checks``.
         """
         manager = model_class._default_manager
         if hasattr(manager, 'all_with_deleted'):
@@ -170,6 +238,6 @@ class LogicalDeleteModel(models.Model):
 
 # add field with deletion datetime to model with configurable name
 LogicalDeleteModel.add_to_class(
-    app_settings.FIELD_NAME,
+    _FIELD_NAME,
     models.DateTimeField(null=True, blank=True, editable=False)
 )
@@ -1,42 +1,73 @@
 from django.db.models.query import QuerySet
 
 from . import settings as app_settings
-from .deletion import LogicalDeleteCollector
+from .deletion import soft_delete
 
 
 class LogicalDeleteQuerySet(QuerySet):
     filter_key = '{field_name}__isnull'.format(
         field_name=app_settings.FIELD_NAME
     )
+    # lookups are built once to not create them on every filter call
+    _NOT_DELETED_KW = {filter_key: True}
+    _DELETED_KW = {filter_key: False}
 
     def deleted(self):
         """Custom filter for retrieving deleted objects only"""
-        return self.filter(**{self.filter_key: False})
+        return self.filter(**self._DELETED_KW)
 
     def not_deleted(self):
         """Custom filter for retrieving not deleted objects only"""
-        return self.filter(**{self.filter_key: True})
+        return self.filter(**self._NOT_DELETED_KW)
 
     def delete(self, hard_delete=False):
         """Delete objects in queryset.
 
+        Objects are soft-deleted with a single ``UPDATE``. Their related
+        objects are deleted in bulk, see `soft_delete`. Already
+        soft-deleted objects of the queryset are left as is.
+
         Args:
             hard_delete(bool): force hard object deletion
+
+        Returns:
+            (int, dict): number of deleted objects and number of deleted
+            objects per model label, the same as ``QuerySet.delete()``
         """
         if hard_delete:
             return self.hard_delete()
         msg = 'Cannot use "limit" or "offset" with delete.'
         assert self.query.can_filter(), msg
-        for obj in self.all():
-            obj.delete()
+
+        # Already soft-deleted objects are skipped, so their deletion dates
+        # aren't changed and signals aren't sent again
+        del_query = self.not_deleted()
+
+        # The delete is actually 2 queries - one to find related objects,
+        # and one to update them. Make sure that the discovery of related
+        # objects is performed on the same database as the deletion.
+        del_query._for_write = True
+
+        # Disable non-supported fields.
+        del_query.query.select_for_update = False
+        del_query.query.select_related = False
+        del_query.query.clear_ordering(force=True)
+
+        objs = list(del_query)
+        if not objs:
+            return 0, {}
+
+        deleted = soft_delete(self.model, objs, del_query.db)
         self._result_cache = None
+        return deleted
     delete.alters_data = True
 
     def hard_delete(self):
         """Method to hard delete object.
 
-        This is the original `delete()` method from ``QuerySet`` class, but
-        with using of ``LogicalDeleteCollector`` instead of ``Collector``.
+        This is the original `delete()` method from ``QuerySet`` class. It
+        uses original ``Collector``, so soft-deleted related objects are
+        deleted too.
 
         """
         return super().delete()
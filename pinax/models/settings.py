@@ -13,3 +13,11 @@ ACCESSIBLE_BY_PK = getattr(
     'LOGICAL_DELETE_ACCESSIBLE_BY_PK',
     True
 )
+
+# max number of objects of each model listed on delete confirmation pages,
+# `None` to list all objects
+MAX_DISPLAY_PER_MODEL = getattr(
+    settings,
+    'LOGICAL_DELETE_MAX_DISPLAY_PER_MODEL',
+    200
+)
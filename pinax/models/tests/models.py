@@ -0,0 +1,86 @@
+from django.db import models
+
+from ..models import LogicalDeleteModel
+
+
+class Author(LogicalDeleteModel):
+    name = models.CharField(max_length=50)
+
+    def __str__(self):
+        return self.name
+
+
+class AuthorProxy(Author):
+
+    class Meta:
+        proxy = True
+
+
+class Book(LogicalDeleteModel):
+    author = models.ForeignKey(
+        Author, on_delete=models.CASCADE, related_name="books"
+    )
+    title = models.CharField(max_length=50)
+
+    class Meta:
+        unique_together = [("author", "title")]
+
+    def __str__(self):
+        return self.title
+
+
+class Chapter(LogicalDeleteModel):
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="chapters"
+    )
+    number = models.PositiveIntegerField()
+
+
+class Review(models.Model):
+    """Model without logical delete, it's deleted with its author"""
+    author = models.ForeignKey(Author, on_delete=models.CASCADE)
+
+
+class Note(models.Model):
+    author = models.ForeignKey(
+        Author, on_delete=models.SET_NULL, null=True, blank=True
+    )
+
+
+class Contract(LogicalDeleteModel):
+    author = models.ForeignKey(Author, on_delete=models.PROTECT)
+
+
+class Edition(LogicalDeleteModel):
+    isbn = models.CharField(max_length=20, unique=True)
+    code = models.CharField(max_length=20, unique=True)
+    language = models.CharField(max_length=20)
+
+    class Meta:
+        unique_together = [("isbn", "language")]
+
+
+class Series(LogicalDeleteModel):
+    name = models.CharField(max_length=50)
+
+    @classmethod
+    def get_softdelete_prefetches(cls):
+        return ["labels"]
+
+
+class Label(models.Model):
+    """Model with relation which isn't walked by the collector"""
+    series = models.ForeignKey(
+        Series, on_delete=models.DO_NOTHING, related_name="labels"
+    )
+
+
+class Publisher(LogicalDeleteModel):
+    code = models.CharField(max_length=20, unique=True)
+
+
+class Magazine(LogicalDeleteModel):
+    """Model with relation to non-primary key field"""
+    publisher = models.ForeignKey(
+        Publisher, on_delete=models.CASCADE, to_field="code"
+    )
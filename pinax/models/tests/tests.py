@@ -1,7 +1,546 @@
-from django.test import TestCase
+import copy
+from unittest import mock
 
+from django.contrib.admin import AdminSite, ModelAdmin
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import ProtectedError
+from django.test import RequestFactory, TestCase, TransactionTestCase
 
-class Tests(TestCase):
+from .. import settings as app_settings
+from ..actions import logical_delete_selected
+from ..admin import LogicalDeleteModelAdmin, LogicalDeleteViewMixin
+from ..signals import post_softdelete, pre_softdelete
+from ..utils import (
+    get_collector, get_logical_deleted_objects, get_related_objects
+)
+from .models import (
+    Author, AuthorProxy, Book, Chapter, Contract, Edition, Label, Magazine,
+    Note, Publisher, Review, Series,
+)
+
+
+class SignalsMixin(object):
+
+    def connect_signals(self):
+        self.pre_deleted = []
+        self.post_deleted = []
+
+        def on_pre_softdelete(sender, instance, **kwargs):
+            self.pre_deleted.append(instance)
+
+        def on_post_softdelete(sender, instance, **kwargs):
+            self.post_deleted.append(instance)
+
+        pre_softdelete.connect(on_pre_softdelete)
+        post_softdelete.connect(on_post_softdelete)
+        self.addCleanup(pre_softdelete.disconnect, on_pre_softdelete)
+        self.addCleanup(post_softdelete.disconnect, on_post_softdelete)
+
+
+class ManagerTests(TestCase):
+
+    def setUp(self):
+        # build base queryset of the default manager
+        Author.objects.all_with_deleted()
+
+    def test_db_manager(self):
+        manager = Author.objects.db_manager("other")
+
+        self.assertEqual(manager.all_with_deleted().db, "other")
+        self.assertEqual(manager.all().db, "other")
+        self.assertEqual(Author.objects.all_with_deleted().db, "default")
+
+    def test_proxy_model(self):
+        self.assertIs(AuthorProxy.objects.all_with_deleted().model, AuthorProxy)
+        self.assertIs(AuthorProxy.objects.only_deleted().model, AuthorProxy)
+        self.assertIs(Author.objects.all_with_deleted().model, Author)
+
+    def test_copied_manager(self):
+        # managers are copied for child models the same way, see
+        # `Options.managers`
+        manager = copy.copy(Author.objects)
+        manager.model = AuthorProxy
+
+        self.assertIs(manager.all_with_deleted().model, AuthorProxy)
+        self.assertIs(manager.all().model, AuthorProxy)
+
+
+class ModelDeleteTests(SignalsMixin, TestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name="Author")
+        self.book = Book.objects.create(author=self.author, title="Book")
+        self.chapter = Chapter.objects.create(book=self.book, number=1)
+        self.review = Review.objects.create(author=self.author)
+        self.note = Note.objects.create(author=self.author)
+
+    def test_cascade(self):
+        self.author.delete()
+
+        self.assertFalse(self.author.active())
+        self.assertFalse(Author.objects.exists())
+        self.assertFalse(Book.objects.exists())
+        self.assertFalse(Chapter.objects.exists())
+        self.assertEqual(Book.objects.all_with_deleted().count(), 1)
+        self.assertEqual(Chapter.objects.all_with_deleted().count(), 1)
+        self.assertFalse(Review.objects.exists())
+        self.note.refresh_from_db()
+        self.assertIsNone(self.note.author_id)
+
+    def test_cascade_deletion_date(self):
+        self.author.delete()
+
+        date_removed = self.author.date_removed
+        self.assertIsNotNone(date_removed)
+        for model in (Author, Book, Chapter):
+            self.assertEqual(
+                model.objects.only_deleted().get().date_removed, date_removed
+            )
+
+    def test_returns_counts(self):
+        self.assertEqual(self.author.delete(), (4, {
+            "tests.Author": 1,
+            "tests.Book": 1,
+            "tests.Chapter": 1,
+            "tests.Review": 1,
+        }))
+
+    def test_signals(self):
+        self.connect_signals()
+
+        self.author.delete()
+
+        self.assertCountEqual(
+            self.pre_deleted, [self.author, self.book, self.chapter]
+        )
+        self.assertCountEqual(
+            self.post_deleted, [self.author, self.book, self.chapter]
+        )
+
+    def test_without_signals(self):
+        self.connect_signals()
+
+        self.author.delete(signals=False)
+
+        self.assertEqual(self.pre_deleted, [])
+        self.assertEqual(self.post_deleted, [])
+        self.assertFalse(Book.objects.exists())
+
+    def test_already_deleted_related_objects(self):
+        self.book.delete()
+        date_removed = Book.objects.all_with_deleted().get().date_removed
+        self.connect_signals()
+
+        self.author.delete()
+
+        self.assertEqual(self.pre_deleted, [self.author])
+        self.assertEqual(
+            Book.objects.all_with_deleted().get().date_removed, date_removed
+        )
+
+    def test_protected(self):
+        Contract.objects.create(author=self.author)
+
+        with self.assertRaises(ProtectedError):
+            self.author.delete()
+
+        self.assertTrue(Author.objects.exists())
+        self.assertTrue(Book.objects.exists())
+        self.assertTrue(Review.objects.exists())
+
+    def test_protected_by_deleted_object(self):
+        Contract.objects.create(author=self.author).delete()
+
+        self.author.delete()
+
+        self.assertFalse(Author.objects.exists())
+
+    def test_repeated_delete(self):
+        self.author.delete()
+        date_removed = self.author.date_removed
+        self.connect_signals()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.author.delete(), (0, {}))
+
+        self.assertEqual(self.pre_deleted, [])
+        self.assertEqual(
+            Author.objects.all_with_deleted().get().date_removed, date_removed
+        )
+
+    def test_hard_delete(self):
+        self.book.delete()
+
+        self.author.delete(hard_delete=True)
+
+        self.assertFalse(Author.objects.all_with_deleted().exists())
+        self.assertFalse(Book.objects.all_with_deleted().exists())
+        self.assertFalse(Chapter.objects.all_with_deleted().exists())
+
+
+class QuerySetDeleteTests(SignalsMixin, TestCase):
 
     def setUp(self):
-        pass
+        self.authors = [
+            Author.objects.create(name="Author %s" % i) for i in range(3)
+        ]
+        for author in self.authors:
+            book = Book.objects.create(author=author, title="Book")
+            Chapter.objects.create(book=book, number=1)
+            Chapter.objects.create(book=book, number=2)
+            Note.objects.create(author=author)
+
+    def test_counts(self):
+        deleted = Author.objects.filter(
+            pk__in=[author.pk for author in self.authors[:2]]
+        ).delete()
+
+        self.assertEqual(deleted, (8, {
+            "tests.Author": 2,
+            "tests.Book": 2,
+            "tests.Chapter": 4,
+        }))
+        self.assertEqual(Author.objects.count(), 1)
+        self.assertEqual(Book.objects.count(), 1)
+        self.assertEqual(Chapter.objects.count(), 2)
+        self.assertEqual(Note.objects.filter(author=None).count(), 2)
+
+    def test_empty(self):
+        self.assertEqual(Author.objects.none().delete(), (0, {}))
+
+    def test_signals(self):
+        self.connect_signals()
+
+        Author.objects.all().delete()
+
+        self.assertEqual(len(self.pre_deleted), 12)
+        self.assertEqual(len(self.post_deleted), 12)
+
+    def test_already_deleted(self):
+        self.authors[0].delete()
+        date_removed = self.authors[0].date_removed
+        self.connect_signals()
+
+        deleted, _ = Author.objects.all_with_deleted().delete()
+
+        self.assertEqual(deleted, 8)
+        self.assertNotIn(self.authors[0], self.pre_deleted)
+        self.assertEqual(
+            Author.objects.all_with_deleted().get(
+                pk=self.authors[0].pk
+            ).date_removed,
+            date_removed
+        )
+
+    def test_protected(self):
+        Contract.objects.create(author=self.authors[0])
+
+        with self.assertRaises(ProtectedError):
+            Author.objects.all().delete()
+
+        self.assertEqual(Author.objects.count(), 3)
+        self.assertEqual(Chapter.objects.count(), 6)
+
+
+class ToFieldCascadeTests(TestCase):
+
+    def setUp(self):
+        # primary keys and codes of publishers don't match each other
+        self.publishers = [
+            Publisher.objects.create(code=str(code)) for code in (2, 1, 3)
+        ]
+        for publisher in self.publishers:
+            Magazine.objects.create(publisher=publisher)
+
+    def test_model_delete(self):
+        self.publishers[0].delete()
+
+        self.assertCountEqual(
+            Magazine.objects.values_list("publisher_id", flat=True),
+            ["1", "3"]
+        )
+
+    def test_queryset_delete(self):
+        deleted = Publisher.objects.filter(code__in=["2", "3"]).delete()
+
+        self.assertEqual(deleted, (4, {
+            "tests.Publisher": 2,
+            "tests.Magazine": 2,
+        }))
+        self.assertEqual(
+            list(Magazine.objects.values_list("publisher_id", flat=True)),
+            ["1"]
+        )
+
+
+class SoftDeletePrefetchesTests(TestCase):
+
+    def setUp(self):
+        for i in range(3):
+            series = Series.objects.create(name="Series %s" % i)
+            Label.objects.create(series=series)
+            Label.objects.create(series=series)
+        self.labels = {}
+
+        def on_pre_softdelete(sender, instance, **kwargs):
+            self.labels[instance] = list(instance.labels.all())
+
+        pre_softdelete.connect(on_pre_softdelete, sender=Series)
+        self.addCleanup(
+            pre_softdelete.disconnect, on_pre_softdelete, sender=Series
+        )
+
+    def test_queryset_delete(self):
+        # select series, prefetch labels, update series
+        with self.assertNumQueries(3):
+            Series.objects.all().delete()
+
+        self.assertEqual(len(self.labels), 3)
+        for labels in self.labels.values():
+            self.assertEqual(len(labels), 2)
+
+
+class UniqueChecksTests(TestCase):
+
+    def setUp(self):
+        self.edition = Edition.objects.create(
+            isbn="1", code="1", language="en"
+        )
+
+    def test_deleted_object_conflicts(self):
+        self.edition.delete()
+
+        with self.assertRaises(ValidationError) as e:
+            Edition(isbn="2", code="1", language="en").validate_unique()
+
+        self.assertEqual(list(e.exception.message_dict), ["code"])
+
+    def test_several_failed_checks(self):
+        with self.assertNumQueries(1):
+            with self.assertRaises(ValidationError) as e:
+                Edition(isbn="1", code="2", language="en").validate_unique()
+
+        self.assertCountEqual(
+            e.exception.message_dict, ["isbn", NON_FIELD_ERRORS]
+        )
+
+    def test_queryset_hook_gets_lookups(self):
+        hook = Edition._get_queryset_for_unique_checks
+        with mock.patch.object(
+            Edition, "_get_queryset_for_unique_checks",
+            autospec=True, side_effect=hook
+        ) as mocked_hook:
+            with self.assertRaises(ValidationError):
+                Edition(isbn="1", code="2", language="en").validate_unique()
+
+        lookups = [call[0][2] for call in mocked_hook.call_args_list]
+        self.assertCountEqual(lookups, [
+            {"isbn": "1"},
+            {"code": "2"},
+            {"isbn": "1", "language": "en"},
+        ])
+
+    def test_no_failed_checks(self):
+        with self.assertNumQueries(1):
+            Edition(isbn="2", code="2", language="en").validate_unique()
+
+    def test_editing_object(self):
+        self.edition.validate_unique()
+
+
+class LogicalDeletedObjectsTests(TestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name="Author")
+        for i in range(3):
+            book = Book.objects.create(author=self.author, title="Book %s" % i)
+            for number in range(2):
+                Chapter.objects.create(book=book, number=number)
+
+    def get_deleted_objects(self):
+        return get_logical_deleted_objects(
+            [self.author], Author._meta, AnonymousUser(), AdminSite(),
+            DEFAULT_DB_ALIAS
+        )
+
+    def test_all_objects(self):
+        to_delete, model_count, perms_needed, protected = (
+            self.get_deleted_objects()
+        )
+
+        self.assertEqual(len(to_delete), 2)
+        self.assertEqual(len(to_delete[1]), 6)
+        self.assertEqual(
+            model_count, {"authors": 1, "books": 3, "chapters": 6}
+        )
+        self.assertEqual(perms_needed, set())
+        self.assertEqual(protected, [])
+
+    def test_truncated(self):
+        with mock.patch.object(app_settings, "MAX_DISPLAY_PER_MODEL", 2):
+            to_delete, model_count, _, _ = self.get_deleted_objects()
+
+        # 2 books, the first one with both chapters
+        self.assertEqual(len(to_delete[1]), 3)
+        self.assertEqual(to_delete[2:], [
+            "...and 1 more book",
+            "...and 4 more chapters",
+        ])
+        self.assertEqual(
+            model_count, {"authors": 1, "books": 3, "chapters": 6}
+        )
+
+    def test_protected(self):
+        Contract.objects.create(author=self.author)
+
+        _, _, _, protected = self.get_deleted_objects()
+
+        self.assertEqual(len(protected), 1)
+
+
+class RelatedObjectsTests(TestCase):
+
+    def setUp(self):
+        self.author = Author.objects.create(name="Author")
+        self.book = Book.objects.create(author=self.author, title="Book")
+
+    def test_related_objects(self):
+        self.assertEqual(list(get_related_objects(self.author)), [self.book])
+
+    def test_collector_is_reused(self):
+        collector = get_collector(self.author)
+
+        with self.assertNumQueries(0):
+            related = list(get_related_objects(self.author, collector=collector))
+
+        self.assertEqual(related, [self.book])
+
+    def test_protected(self):
+        Contract.objects.create(author=self.author)
+
+        with self.assertRaises(ProtectedError):
+            get_related_objects(self.author)
+
+
+class AuthorAdmin(LogicalDeleteViewMixin, LogicalDeleteModelAdmin):
+    pass
+
+
+class AdminDeleteTests(TestCase):
+
+    def setUp(self):
+        self.authors = [
+            Author.objects.create(name="Author %s" % i) for i in range(3)
+        ]
+        self.authors[0].delete()
+        self.modeladmin = AuthorAdmin(Author, AdminSite())
+        self.request = RequestFactory().post("/", {"post": "yes"})
+        self.request.user = AnonymousUser()
+
+    def test_action_skips_deleted_objects(self):
+        logged = []
+
+        def log_deletions(request, queryset):
+            logged.extend(queryset)
+
+        with mock.patch.multiple(
+            ModelAdmin, has_delete_permission=mock.DEFAULT,
+            message_user=mock.DEFAULT,
+        ) as mocked, mock.patch.object(
+            ModelAdmin, "log_deletions", side_effect=log_deletions
+        ):
+            logical_delete_selected(
+                self.modeladmin, self.request,
+                Author.objects.all_with_deleted()
+            )
+
+        self.assertCountEqual(logged, self.authors[1:])
+        message = mocked["message_user"].call_args[0][1]
+        self.assertEqual(message, "Successfully deleted 2 authors.")
+        self.assertFalse(Author.objects.exists())
+
+    def test_action_with_only_deleted_objects(self):
+        with mock.patch.multiple(
+            ModelAdmin, has_delete_permission=mock.DEFAULT,
+            log_deletions=mock.DEFAULT, message_user=mock.DEFAULT,
+        ) as mocked:
+            logical_delete_selected(
+                self.modeladmin, self.request,
+                Author.objects.only_deleted()
+            )
+
+        mocked["log_deletions"].assert_not_called()
+        mocked["message_user"].assert_not_called()
+
+    def test_delete_view_of_deleted_object(self):
+        date_removed = self.authors[0].date_removed
+
+        with mock.patch.multiple(
+            ModelAdmin, has_delete_permission=mock.DEFAULT,
+            log_deletion=mock.DEFAULT,
+            _get_obj_does_not_exist_redirect=mock.DEFAULT,
+        ) as mocked:
+            self.modeladmin._delete_view(
+                self.request, str(self.authors[0].pk), None
+            )
+
+        mocked["_get_obj_does_not_exist_redirect"].assert_called_once()
+        mocked["log_deletion"].assert_not_called()
+        self.assertEqual(
+            Author.objects.only_deleted().get().date_removed, date_removed
+        )
+
+
+class OtherDatabaseTests(TransactionTestCase):
+    databases = {"default", "other"}
+
+    def setUp(self):
+        for using in ("default", "other"):
+            author = Author.objects.using(using).create(name="Author")
+            book = Book.objects.using(using).create(author=author, title="Book")
+            Chapter.objects.using(using).create(book=book, number=1)
+            Note.objects.using(using).create(author=author)
+
+    def assertNotDeleted(self, using):
+        self.assertEqual(Author.objects.using(using).count(), 1)
+        self.assertEqual(Book.objects.using(using).count(), 1)
+        self.assertEqual(Chapter.objects.using(using).count(), 1)
+        self.assertFalse(
+            Note.objects.using(using).filter(author=None).exists()
+        )
+
+    def assertDeleted(self, using):
+        self.assertFalse(Author.objects.using(using).exists())
+        self.assertFalse(Book.objects.using(using).exists())
+        self.assertFalse(Chapter.objects.using(using).exists())
+        self.assertTrue(
+            Note.objects.using(using).filter(author=None).exists()
+        )
+
+    def test_model_delete(self):
+        Author.objects.using("other").get().delete()
+
+        self.assertDeleted("other")
+        self.assertNotDeleted("default")
+
+    def test_queryset_delete(self):
+        Author.objects.using("other").all().delete()
+
+        self.assertDeleted("other")
+        self.assertNotDeleted("default")
+
+    def test_rollback(self):
+        def on_post_softdelete(sender, instance, **kwargs):
+            raise RuntimeError
+
+        post_softdelete.connect(on_post_softdelete, sender=Author)
+        self.addCleanup(
+            post_softdelete.disconnect, on_post_softdelete, sender=Author
+        )
+
+        with self.assertRaises(RuntimeError):
+            Author.objects.using("other").get().delete()
+
+        self.assertNotDeleted("other")
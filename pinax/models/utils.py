@@ -1,17 +1,18 @@
 # -*- coding: utf-8 -*-
 
-import itertools
+from collections import Counter
 
 from django.contrib.admin.utils import quote
 from django.contrib.auth import get_permission_codename
 from django.db import DEFAULT_DB_ALIAS
-from django.db.models.deletion import ProtectedError
 from django.urls import NoReverseMatch, reverse
 from django.utils.encoding import force_str
 from django.utils.html import format_html
 from django.utils.text import capfirst
+from django.utils.translation import ngettext
 
-from .deletion import LogicalDeleteNestedObjects
+from . import settings as app_settings
+from .deletion import LogicalDeleteNestedObjects, get_collected_objects
 
 
 def get_collector(obj, using=DEFAULT_DB_ALIAS, collect=True):
@@ -46,27 +47,17 @@ def get_related_objects(obj, using=DEFAULT_DB_ALIAS, collector=None):
 
     It forbids to delete object if it has protected related objects.
 
+    Attributes:
+          obj (Model): object which related instances should be returned
+          using (str): currently used DB alias
+          collector (LogicalDeleteNestedObjects): collector with already
+          collected related objects of `obj`, see `get_collector`, pass it
+          to not collect them again
+
     """
     if not collector:
         collector = get_collector(obj, using)
-
-    if collector.protected:
-        raise ProtectedError(
-            (
-                'Cannot delete object "{obj}" as it has protected relations.'
-                .format(obj=obj)
-            ),
-            list(collector.protected)
-        )
-
-    def flatten(elem):
-        if isinstance(elem, list):
-            return itertools.chain.from_iterable(map(flatten, elem))
-        elif obj != elem:
-            return (elem,)
-        return ()
-
-    return flatten(collector.nested())
+    return get_collected_objects(collector, [obj])
 
 
 def get_logical_deleted_objects(objs, opts, user, admin_site, using):
@@ -81,27 +72,26 @@ def get_logical_deleted_objects(objs, opts, user, admin_site, using):
     collector.collect(objs)
     perms_needed = set()
 
+    # {model: (opts, has_admin, url_name, has_delete_perm)}
+    model_info = {}
+
     def format_callback(obj):
-        has_admin = obj.__class__ in admin_site._registry
-        opts = obj._meta
+        opts, has_admin, url_name, has_delete_perm = _get_model_info(
+            obj.__class__, admin_site, user, model_info
+        )
 
         no_edit_link = '%s: %s' % (capfirst(opts.verbose_name),
                                    force_str(obj))
 
         if has_admin:
             try:
-                admin_url = reverse('%s:%s_%s_change'
-                                    % (admin_site.name,
-                                       opts.app_label,
-                                       opts.model_name),
-                                    None, (quote(obj._get_pk_val()),))
+                admin_url = reverse(url_name, None,
+                                    (quote(obj._get_pk_val()),))
             except NoReverseMatch:
                 # Change url doesn't exist -- don't display link to edit
                 return no_edit_link
 
-            p = '%s.%s' % (opts.app_label,
-                           get_permission_codename('delete', opts))
-            if not user.has_perm(p):
+            if not has_delete_perm:
                 perms_needed.add(opts.verbose_name)
             # Display a link to the admin page.
             return format_html('{}: <a href="{}">{}</a>',
@@ -113,12 +103,79 @@ def get_logical_deleted_objects(objs, opts, user, admin_site, using):
             # admin or is edited inline.
             return no_edit_link
 
-    to_delete = collector.nested(format_callback)
+    shown = Counter()
+    to_delete = collector.nested(
+        format_callback, limit=app_settings.MAX_DISPLAY_PER_MODEL, shown=shown
+    )
+    to_delete.extend(
+        _get_hidden_objects_summary(collector, shown, format_callback)
+    )
 
     protected = [format_callback(obj) for obj in collector.protected]
     model_count = {
-        model._meta.verbose_name_plural: len(objs)
-        for model, objs in collector.model_objs.items()
+        model._meta.verbose_name_plural: len(instances)
+        for model, instances in collector.data.items()
     }
 
     return to_delete, model_count, perms_needed, protected
+
+
+def _get_model_info(model, admin_site, user, model_info):
+    """Get admin info of `model` used to display its objects.
+
+    Info is the same for all objects of a model, so it's cached in
+    `model_info` dict.
+
+    Returns:
+        (tuple): model options, is model registered in `admin_site`, name of
+        change url and if `user` has permission to delete objects
+
+    """
+    info = model_info.get(model)
+    if info is None:
+        opts = model._meta
+        has_admin = model in admin_site._registry
+        url_name = '%s:%s_%s_change' % (admin_site.name,
+                                        opts.app_label,
+                                        opts.model_name)
+        p = '%s.%s' % (opts.app_label,
+                       get_permission_codename('delete', opts))
+        info = model_info[model] = (
+            opts, has_admin, url_name, has_admin and user.has_perm(p)
+        )
+    return info
+
+
+def _get_hidden_objects_summary(collector, shown, format_callback):
+    """Get summaries of collected objects which aren't displayed.
+
+    Args:
+        collector(LogicalDeleteNestedObjects): collector with objects
+        shown(Counter): numbers of displayed objects per model
+        format_callback(callable): callback which formats objects, it's
+            called for a model with all objects hidden to check permissions
+
+    Returns:
+        (list): '...and N more' lines per model with hidden objects
+
+    """
+    summary = []
+    for model, instances in collector.data.items():
+        if not shown[model]:
+            # all objects of the model are hidden, but user still needs
+            # permission to delete them
+            format_callback(next(iter(instances)))
+        hidden = len(instances) - shown[model]
+        if hidden > 0:
+            summary.append(
+                ngettext(
+                    '...and %(count)d more %(name)s',
+                    '...and %(count)d more %(name_plural)s',
+                    hidden
+                ) % {
+                    'count': hidden,
+                    'name': model._meta.verbose_name,
+                    'name_plural': model._meta.verbose_name_plural,
+                }
+            )
+    return summary
@@ -20,11 +20,16 @@ DEFAULT_SETTINGS = dict(
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": ":memory:",
-        }
+        },
+        "other": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        },
     },
     SITE_ID=1,
     ROOT_URLCONF="pinax.models.tests.urls",
     SECRET_KEY="notasecret",
+    DEFAULT_AUTO_FIELD="django.db.models.AutoField",
 )
 
 